@@ -18,14 +18,17 @@ Key Features:
 - Structured status tracking (pending, in-progress, done)
 """
 
+import contextlib
 import json
 import logging
 import os
 import sys
+from collections.abc import Callable
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from jsonschema import validate
+from jsonschema.protocols import Validator
 from jsonschema.validators import Draft202012Validator
 from mcp.server import Server
 from mcp.types import TextContent, Tool
@@ -34,6 +37,10 @@ from mcp.types import TextContent, Tool
 WORKING_DIR = os.environ.get("TASKFLOW_WORKING_DIR", os.getcwd())
 BASE_DIR = ".tasks"
 
+# Templates used when a document is written without explicit content
+DEFAULT_INVESTIGATION_CONTENT = "# Investigation\n\n"
+DEFAULT_SOLUTION_PLAN_CONTENT = "# Solution Plan\n\n"
+
 
 # Setup logging configuration
 def setup_logging():
@@ -60,28 +67,70 @@ def setup_logging():
 # Initialize logger
 logger = setup_logging()
 
+# Server diagnostics go to stderr, where MCP hosts collect them, and never into tool_actions.log.
+# main() attaches the stderr handler and applies TASKFLOW_LOG_LEVEL.
+diagnostics_logger = logging.getLogger(f"{__name__}.diagnostics")
+diagnostics_logger.propagate = False
+diagnostics_logger.setLevel(logging.WARNING)
+
+
+def _configure_diagnostics_logging() -> None:
+    """Send diagnostics to stderr at the level named by TASKFLOW_LOG_LEVEL (default WARNING)."""
+    if not diagnostics_logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("TaskFlow MCP Server: %(levelname)s: %(message)s"))
+        diagnostics_logger.addHandler(handler)
+    level = os.environ.get("TASKFLOW_LOG_LEVEL", "WARNING").upper()
+    try:
+        diagnostics_logger.setLevel(level)
+    except ValueError:
+        diagnostics_logger.setLevel(logging.WARNING)
+        diagnostics_logger.warning("Ignoring unknown TASKFLOW_LOG_LEVEL %r", level)
+
 
 def _get_log_file_path() -> str:
     """Get the current log file path based on WORKING_DIR."""
     return os.path.join(WORKING_DIR, BASE_DIR, "tool_actions.log")
 
 
-CHECKLIST_SCHEMA = {
-    "type": "array",
-    "items": {
-        "type": "object",
-        "properties": {
-            "label": {"type": "string"},
-            "status": {"enum": ["pending", "in-progress", "done"]},
-            "notes": {"type": ["string", "null"]},
-        },
-        "required": ["label", "status"],
-        "additionalProperties": False,
+CHECKLIST_ITEM_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "label": {"type": "string"},
+        "status": {"enum": ["pending", "in-progress", "done"]},
+        "notes": {"type": ["string", "null"]},
     },
+    "required": ["label", "status"],
+    "additionalProperties": False,
+}
+
+CHECKLIST_SCHEMA: dict[str, Any] = {
+    "type": "array",
+    "items": CHECKLIST_ITEM_SCHEMA,
 }
 
+# Compile the schemas once; building a validator per call dominates the cost of validating small checklists
+Draft202012Validator.check_schema(CHECKLIST_SCHEMA)
+_CHECKLIST_VALIDATOR: Validator = Draft202012Validator(CHECKLIST_SCHEMA)
+_CHECKLIST_ITEM_VALIDATOR: Validator = Draft202012Validator(CHECKLIST_ITEM_SCHEMA)
+
 server = Server(name="taskflow-mcp")
 
+# Directories created by this process; lets repeat writes skip the mkdir syscall
+_created_dirs: set[str] = set()
+
+
+@lru_cache(maxsize=2048)
+def _join_path(*parts: str) -> str:
+    """Memoized os.path.join; a session only ever touches a few dozen task paths."""
+    return os.path.join(*parts)
+
+
+def _task_dir(task_id: str) -> str:
+    """Return the folder holding a task's documents: {WORKING_DIR}/.tasks/{task_id}"""
+    # WORKING_DIR and BASE_DIR are part of the cache key so repointing them (as the tests do) stays safe
+    return _join_path(WORKING_DIR, BASE_DIR, task_id)
+
 
 def task_path(task_id: str, filename: str) -> str:
     """Generate the file path for a task document.
@@ -93,25 +142,73 @@ def task_path(task_id: str, filename: str) -> str:
     Returns:
         Full file path: {WORKING_DIR}/.tasks/{task_id}/{filename}
     """
-    return os.path.join(WORKING_DIR, BASE_DIR, task_id, filename)
+    return _join_path(WORKING_DIR, BASE_DIR, task_id, filename)
+
+
+# ---------------- File helpers ----------------
+
+
+def _ensure_dir(path: str) -> None:
+    """Create a directory (and parents) unless this process already did so."""
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+
+
+def _atomic_write(path: str, data: str) -> None:
+    """Write a task document by swapping in a fully written temporary file.
+
+    Concurrent readers see either the previous or the new contents, never a
+    truncated file, because os.replace renames the temp file over the target.
+
+    Args:
+        path: Destination file path
+        data: Text content to write
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_document(task_id: str, filename: str) -> str:
+    """Read a task document, reporting a missing file by its name.
+
+    Opening directly (rather than checking os.path.exists first) costs a
+    single syscall on the happy path.
+    """
+    try:
+        with open(task_path(task_id, filename)) as f:
+            return f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{filename} not found") from None
 
 
 # ---------------- Checklist helpers ----------------
 
 
 def _load_checklist(task_id: str) -> list[dict[str, Any]]:
-    path = task_path(task_id, "CHECKLIST.json")
-    if not os.path.exists(path):
-        raise FileNotFoundError("CHECKLIST.json not found")
-    with open(path) as f:
-        return json.load(f)
+    """Load CHECKLIST.json and validate all of it; users and other processes may have edited the file."""
+    items = json.loads(_read_document(task_id, "CHECKLIST.json"))
+    _CHECKLIST_VALIDATOR.validate(items)
+    return items
 
 
 def _save_checklist(task_id: str, checklist: list[dict[str, Any]]) -> None:
-    validate(instance=checklist, schema=CHECKLIST_SCHEMA, cls=Draft202012Validator)
+    _CHECKLIST_VALIDATOR.validate(checklist)
+    _write_checklist_file(task_id, checklist)
+
+
+def _write_checklist_file(task_id: str, checklist: list[dict[str, Any]]) -> None:
+    """Write CHECKLIST.json without validation; callers validate whatever they changed."""
     path = task_path(task_id, "CHECKLIST.json")
-    with open(path, "w") as f:
-        json.dump(checklist, f, indent=2)
+    # Encode up front and write once; json.dump issues a write() per token
+    _atomic_write(path, json.dumps(checklist, indent=2))
 
 
 def _log_tool_action(tool_name: str, task_id: str, arguments: dict[str, Any], result: str | None = None) -> None:
@@ -134,15 +231,24 @@ def _log_tool_action(tool_name: str, task_id: str, arguments: dict[str, Any], re
     if result is not None:
         log_entry["result"] = result
 
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]  # Format like logging
+    line = f"{timestamp} - {json.dumps(log_entry)}\n"
+
     # Get the current log file path and ensure directory exists
     log_file_path = _get_log_file_path()
     log_dir = os.path.dirname(log_file_path)
-    os.makedirs(log_dir, exist_ok=True)
+    _ensure_dir(log_dir)
 
     # Write directly to the log file to work with patched WORKING_DIR
-    with open(log_file_path, "a") as f:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]  # Format like logging
-        f.write(f"{timestamp} - {json.dumps(log_entry)}\n")
+    try:
+        with open(log_file_path, "a") as f:
+            f.write(line)
+    except FileNotFoundError:
+        # The .tasks folder was deleted after we created it; recreate it and retry once
+        _created_dirs.discard(log_dir)
+        _ensure_dir(log_dir)
+        with open(log_file_path, "a") as f:
+            f.write(line)
 
 
 # ---------------- Creation Methods ----------------
@@ -151,7 +257,7 @@ def _log_tool_action(tool_name: str, task_id: str, arguments: dict[str, Any], re
 # ---------------- Tool Definitions ----------------
 
 
-def write_investigation(task_id: str, content: str = "# Investigation\n\n") -> str:
+def write_investigation(task_id: str, content: str = DEFAULT_INVESTIGATION_CONTENT) -> str:
     """Write the investigation document for a task (create or overwrite).
 
     This is the first step in the task workflow. Creates INVESTIGATION.md
@@ -164,18 +270,23 @@ def write_investigation(task_id: str, content: str = "# Investigation\n\n") -> s
     Returns:
         Success message with file path
     """
-    print(f"TaskFlow MCP Server: write_investigation called with task_id='{task_id}'", file=sys.stderr)
-    path = task_path(task_id, "INVESTIGATION.md")
-    print(f"TaskFlow MCP Server: Creating file at path: {path}", file=sys.stderr)
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        f.write(content)
-    result = f"Wrote {path}"
-    print(f"TaskFlow MCP Server: {result}", file=sys.stderr)
-    return result
-
-
-def write_solution_plan(task_id: str, content: str = "# Solution Plan\n\n") -> str:
+    diagnostics_logger.debug("write_investigation called with task_id=%r", task_id)
+    task_dir = _task_dir(task_id)
+    path = os.path.join(task_dir, "INVESTIGATION.md")
+    diagnostics_logger.debug("Creating file at path: %s", path)
+    _ensure_dir(task_dir)
+    try:
+        _atomic_write(path, content)
+    except FileNotFoundError:
+        # The task folder was deleted after we created it; recreate it and retry once
+        _created_dirs.discard(task_dir)
+        _ensure_dir(task_dir)
+        _atomic_write(path, content)
+    diagnostics_logger.debug("Wrote %s", path)
+    return f"Wrote {path}"
+
+
+def write_solution_plan(task_id: str, content: str = DEFAULT_SOLUTION_PLAN_CONTENT) -> str:
     """Write a solution plan document for a task (create or overwrite).
 
     Second step in the workflow. Creates SOLUTION_PLAN.md where you plan
@@ -195,8 +306,7 @@ def write_solution_plan(task_id: str, content: str = "# Solution Plan\n\n") -> s
     if not os.path.exists(inv_path):
         raise ValueError("Cannot write SOLUTION_PLAN.md without INVESTIGATION.md")
     path = task_path(task_id, "SOLUTION_PLAN.md")
-    with open(path, "w") as f:
-        f.write(content)
+    _atomic_write(path, content)
     return f"Wrote {path}"
 
 
@@ -230,29 +340,17 @@ def write_checklist(task_id: str, checklist: list[dict[str, Any]] | None = None)
 
 def read_investigation(task_id: str) -> str:
     """Read the investigation document for a task."""
-    path = task_path(task_id, "INVESTIGATION.md")
-    if not os.path.exists(path):
-        raise FileNotFoundError("INVESTIGATION.md not found")
-    with open(path) as f:
-        return f.read()
+    return _read_document(task_id, "INVESTIGATION.md")
 
 
 def read_solution_plan(task_id: str) -> str:
     """Read the solution plan document for a task."""
-    path = task_path(task_id, "SOLUTION_PLAN.md")
-    if not os.path.exists(path):
-        raise FileNotFoundError("SOLUTION_PLAN.md not found")
-    with open(path) as f:
-        return f.read()
+    return _read_document(task_id, "SOLUTION_PLAN.md")
 
 
 def read_checklist(task_id: str) -> str:
     """Read the checklist document for a task as a JSON string."""
-    path = task_path(task_id, "CHECKLIST.json")
-    if not os.path.exists(path):
-        raise FileNotFoundError("CHECKLIST.json not found")
-    with open(path) as f:
-        return f.read()
+    return _read_document(task_id, "CHECKLIST.json")
 
 
 def add_checklist_item(task_id: str, task_label: str) -> str:
@@ -260,8 +358,11 @@ def add_checklist_item(task_id: str, task_label: str) -> str:
     items = _load_checklist(task_id)
     if any(item.get("label") == task_label for item in items):
         raise ValueError("Checklist item already exists with this label")
-    items.append({"label": task_label, "status": "pending", "notes": None})
-    _save_checklist(task_id, items)
+    new_item = {"label": task_label, "status": "pending", "notes": None}
+    # _load_checklist has vouched for the existing items; only the new one needs checking
+    _CHECKLIST_ITEM_VALIDATOR.validate(new_item)
+    items.append(new_item)
+    _write_checklist_file(task_id, items)
     return f"Added item '{task_label}' to {task_path(task_id, 'CHECKLIST.json')}"
 
 
@@ -275,7 +376,8 @@ def set_checklist_item_status(task_id: str, task_label: str, status: str, notes:
             item["status"] = status
             if notes is not None:
                 item["notes"] = notes
-            _save_checklist(task_id, items)
+            _CHECKLIST_ITEM_VALIDATOR.validate(item)
+            _write_checklist_file(task_id, items)
             return f"Updated item '{task_label}' in {task_path(task_id, 'CHECKLIST.json')}"
     raise FileNotFoundError("Checklist item not found")
 
@@ -286,10 +388,149 @@ def remove_checklist_item(task_id: str, task_label: str) -> str:
     new_items = [it for it in items if it.get("label") != task_label]
     if len(new_items) == len(items):
         raise FileNotFoundError("Checklist item not found")
-    _save_checklist(task_id, new_items)
+    # _load_checklist has vouched for the remaining items, and dropping one cannot invalidate the rest
+    _write_checklist_file(task_id, new_items)
     return f"Removed item '{task_label}' from {task_path(task_id, 'CHECKLIST.json')}"
 
 
+# Tool definitions are static, so build them once instead of on every tools/list request
+_TOOLS: list[Tool] = [
+    Tool(
+        name="write_investigation",
+        description="Write the investigation document for a task (create or overwrite)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "The task ID"},
+                "content": {
+                    "type": "string",
+                    "description": "The investigation content",
+                    "default": DEFAULT_INVESTIGATION_CONTENT,
+                },
+            },
+            "required": ["task_id"],
+        },
+    ),
+    Tool(
+        name="write_solution_plan",
+        description="Write the solution plan document for a task (requires investigation)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "The task ID"},
+                "content": {
+                    "type": "string",
+                    "description": "The solution plan content",
+                    "default": DEFAULT_SOLUTION_PLAN_CONTENT,
+                },
+            },
+            "required": ["task_id"],
+        },
+    ),
+    Tool(
+        name="write_checklist",
+        description="Write the checklist document for a task (requires solution plan)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "The task ID"},
+                "checklist": {
+                    "type": "array",
+                    "description": "The checklist items",
+                    "default": [],
+                },
+            },
+            "required": ["task_id"],
+        },
+    ),
+    Tool(
+        name="read_investigation",
+        description="Read the investigation document for a task",
+        inputSchema={
+            "type": "object",
+            "properties": {"task_id": {"type": "string", "description": "The task ID"}},
+            "required": ["task_id"],
+        },
+    ),
+    Tool(
+        name="read_solution_plan",
+        description="Read the solution plan document for a task",
+        inputSchema={
+            "type": "object",
+            "properties": {"task_id": {"type": "string", "description": "The task ID"}},
+            "required": ["task_id"],
+        },
+    ),
+    Tool(
+        name="read_checklist",
+        description="Read the checklist document for a task",
+        inputSchema={
+            "type": "object",
+            "properties": {"task_id": {"type": "string", "description": "The task ID"}},
+            "required": ["task_id"],
+        },
+    ),
+    Tool(
+        name="add_checklist_item",
+        description="Add a single checklist item (label acts as item id)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "The task ID"},
+                "task_label": {"type": "string", "description": "Checklist item label (acts as id)"},
+            },
+            "required": ["task_id", "task_label"],
+        },
+    ),
+    Tool(
+        name="set_checklist_item_status",
+        description="Update status/notes for one checklist item by label",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "The task ID"},
+                "task_label": {"type": "string", "description": "Checklist item label (acts as id)"},
+                "status": {"type": "string", "enum": ["pending", "in-progress", "done"]},
+                "notes": {"type": ["string", "null"], "description": "Optional notes"},
+            },
+            "required": ["task_id", "task_label", "status"],
+        },
+    ),
+    Tool(
+        name="remove_checklist_item",
+        description="Remove a single checklist item by label",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "The task ID"},
+                "task_label": {"type": "string", "description": "Checklist item label (acts as id)"},
+            },
+            "required": ["task_id", "task_label"],
+        },
+    ),
+]
+
+
+# Maps tool names to callables that unpack the MCP arguments and run the tool
+_TOOL_HANDLERS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "write_investigation": lambda a: write_investigation(
+        task_id=a["task_id"], content=a.get("content", DEFAULT_INVESTIGATION_CONTENT)
+    ),
+    "write_solution_plan": lambda a: write_solution_plan(
+        task_id=a["task_id"], content=a.get("content", DEFAULT_SOLUTION_PLAN_CONTENT)
+    ),
+    "write_checklist": lambda a: write_checklist(task_id=a["task_id"], checklist=a.get("checklist", [])),
+    "read_investigation": lambda a: read_investigation(task_id=a["task_id"]),
+    "read_solution_plan": lambda a: read_solution_plan(task_id=a["task_id"]),
+    "read_checklist": lambda a: read_checklist(task_id=a["task_id"]),
+    "add_checklist_item": lambda a: add_checklist_item(task_id=a["task_id"], task_label=a["task_label"]),
+    "set_checklist_item_status": lambda a: set_checklist_item_status(
+        task_id=a["task_id"], task_label=a["task_label"], status=a["status"], notes=a.get("notes")
+    ),
+    "remove_checklist_item": lambda a: remove_checklist_item(task_id=a["task_id"], task_label=a["task_label"]),
+}
+
+
 # Register tools with the server
 @server.list_tools()
 async def list_tools() -> list[Tool]:
@@ -301,122 +542,7 @@ async def list_tools() -> list[Tool]:
     Returns:
         List of Tool objects with their schemas and descriptions
     """
-
-    return [
-        Tool(
-            name="write_investigation",
-            description="Write the investigation document for a task (create or overwrite)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "The task ID"},
-                    "content": {
-                        "type": "string",
-                        "description": "The investigation content",
-                        "default": "# Investigation\n\n",
-                    },
-                },
-                "required": ["task_id"],
-            },
-        ),
-        Tool(
-            name="write_solution_plan",
-            description="Write the solution plan document for a task (requires investigation)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "The task ID"},
-                    "content": {
-                        "type": "string",
-                        "description": "The solution plan content",
-                        "default": "# Solution Plan\n\n",
-                    },
-                },
-                "required": ["task_id"],
-            },
-        ),
-        Tool(
-            name="write_checklist",
-            description="Write the checklist document for a task (requires solution plan)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "The task ID"},
-                    "checklist": {
-                        "type": "array",
-                        "description": "The checklist items",
-                        "default": [],
-                    },
-                },
-                "required": ["task_id"],
-            },
-        ),
-        Tool(
-            name="read_investigation",
-            description="Read the investigation document for a task",
-            inputSchema={
-                "type": "object",
-                "properties": {"task_id": {"type": "string", "description": "The task ID"}},
-                "required": ["task_id"],
-            },
-        ),
-        Tool(
-            name="read_solution_plan",
-            description="Read the solution plan document for a task",
-            inputSchema={
-                "type": "object",
-                "properties": {"task_id": {"type": "string", "description": "The task ID"}},
-                "required": ["task_id"],
-            },
-        ),
-        Tool(
-            name="read_checklist",
-            description="Read the checklist document for a task",
-            inputSchema={
-                "type": "object",
-                "properties": {"task_id": {"type": "string", "description": "The task ID"}},
-                "required": ["task_id"],
-            },
-        ),
-        Tool(
-            name="add_checklist_item",
-            description="Add a single checklist item (label acts as item id)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "The task ID"},
-                    "task_label": {"type": "string", "description": "Checklist item label (acts as id)"},
-                },
-                "required": ["task_id", "task_label"],
-            },
-        ),
-        Tool(
-            name="set_checklist_item_status",
-            description="Update status/notes for one checklist item by label",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "The task ID"},
-                    "task_label": {"type": "string", "description": "Checklist item label (acts as id)"},
-                    "status": {"type": "string", "enum": ["pending", "in-progress", "done"]},
-                    "notes": {"type": ["string", "null"], "description": "Optional notes"},
-                },
-                "required": ["task_id", "task_label", "status"],
-            },
-        ),
-        Tool(
-            name="remove_checklist_item",
-            description="Remove a single checklist item by label",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "The task ID"},
-                    "task_label": {"type": "string", "description": "Checklist item label (acts as id)"},
-                },
-                "required": ["task_id", "task_label"],
-            },
-        ),
-    ]
+    return _TOOLS
 
 
 @server.call_tool()
@@ -436,39 +562,12 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     Raises:
         ValueError: If the tool name is not recognized
     """
-    print(f"TaskFlow MCP Server: Tool call received - name='{name}', arguments={arguments}", file=sys.stderr)
+    diagnostics_logger.debug("Tool call received - name=%r, arguments=%s", name, arguments)
 
-    if name == "write_investigation":
-        result = write_investigation(
-            task_id=arguments["task_id"],
-            content=arguments.get("content", "# Investigation\n\n"),
-        )
-    elif name == "write_solution_plan":
-        result = write_solution_plan(
-            task_id=arguments["task_id"],
-            content=arguments.get("content", "# Solution Plan\n\n"),
-        )
-    elif name == "write_checklist":
-        result = write_checklist(task_id=arguments["task_id"], checklist=arguments.get("checklist", []))
-    elif name == "read_investigation":
-        result = read_investigation(task_id=arguments["task_id"])  # returns string
-    elif name == "read_solution_plan":
-        result = read_solution_plan(task_id=arguments["task_id"])  # returns string
-    elif name == "read_checklist":
-        result = read_checklist(task_id=arguments["task_id"])  # returns JSON string
-    elif name == "add_checklist_item":
-        result = add_checklist_item(task_id=arguments["task_id"], task_label=arguments["task_label"])
-    elif name == "set_checklist_item_status":
-        result = set_checklist_item_status(
-            task_id=arguments["task_id"],
-            task_label=arguments["task_label"],
-            status=arguments["status"],
-            notes=arguments.get("notes"),
-        )
-    elif name == "remove_checklist_item":
-        result = remove_checklist_item(task_id=arguments["task_id"], task_label=arguments["task_label"])
-    else:
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
+    result = handler(arguments)
 
     # Log the tool action
     _log_tool_action(name, arguments["task_id"], arguments, result)
@@ -479,6 +578,20 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 # ---------------- Entrypoint ----------------
 
 
+async def _run_server() -> None:
+    """Serve MCP requests over stdin/stdout until the client disconnects."""
+    from mcp import stdio_server
+
+    # Build these before opening stdio so the handshake can start as soon as the streams are up
+    init_options = server.create_initialization_options()
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(
+            read_stream=read_stream,
+            write_stream=write_stream,
+            initialization_options=init_options,
+        )
+
+
 def main() -> None:
     """Start the TaskFlow MCP server.
 
@@ -487,7 +600,7 @@ def main() -> None:
     """
     import asyncio
 
-    from mcp import stdio_server
+    _configure_diagnostics_logging()
 
     # Create .tasks directory and print debug information
     try:
@@ -504,15 +617,7 @@ def main() -> None:
     except Exception as e:
         print(f"TaskFlow MCP Server: Error creating .tasks directory: {e}", file=sys.stderr)
 
-    async def run_server():
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream=read_stream,
-                write_stream=write_stream,
-                initialization_options=server.create_initialization_options(),
-            )
-
-    asyncio.run(run_server())
+    asyncio.run(_run_server())
 
 
 if __name__ == "__main__":
@@ -1,33 +1,44 @@
 """Pytest configuration and fixtures for taskflow-mcp tests."""
 
+import os
 import shutil
 import tempfile
-from collections.abc import Generator
 from pathlib import Path
 from typing import Any
 
 import pytest
 
+from taskflow_mcp import server
+
+SHM_DIR = "/dev/shm"
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Keep tmp_path on tmpfs when /dev/shm is available and no --basetemp was given."""
+    if config.option.basetemp is None and os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        basetemp = tempfile.mkdtemp(prefix="taskflow-pytest-", dir=SHM_DIR)
+        config.option.basetemp = basetemp
+        config.add_cleanup(lambda: shutil.rmtree(basetemp, ignore_errors=True))
 
-@pytest.fixture
-def temp_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory for testing."""
-    temp_path = Path(tempfile.mkdtemp())
-    yield temp_path
-    shutil.rmtree(temp_path)
+
+@pytest.fixture(autouse=True)
+def isolated_working_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Point the server at a per-test working directory so .tasks lands under tmp_path."""
+    monkeypatch.setattr(server, "WORKING_DIR", str(tmp_path))
+    return tmp_path
 
 
 @pytest.fixture
-def mock_base_dir(temp_dir: Path) -> Generator[Path, None, None]:
+def mock_base_dir(tmp_path: Path) -> Path:
     """Create a mock .tasks directory for testing."""
-    base_dir = temp_dir / ".tasks"
+    base_dir = tmp_path / ".tasks"
     base_dir.mkdir()
-    yield base_dir
+    return base_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_checklist() -> list[dict[str, Any]]:
-    """Sample checklist data for testing."""
+    """Sample checklist data for testing; shared across the session, so tests must not mutate it."""
     return [
         {
             "label": "Set up project structure",
@@ -43,7 +54,7 @@ def sample_checklist() -> list[dict[str, Any]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_investigation_content() -> str:
     """Sample investigation content for testing."""
     return """# Investigation
@@ -59,7 +70,7 @@ Users are experiencing slow response times.
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_solution_plan_content() -> str:
     """Sample solution plan content for testing."""
     return """# Solution Plan
@@ -75,3 +86,23 @@ Implement database query optimization and caching.
 ## Timeline
 Expected completion: 2 weeks
 """
+
+
+@pytest.fixture
+def prepared_task(
+    isolated_working_dir: Path, sample_investigation_content: str, sample_solution_plan_content: str
+) -> str:
+    """Create a task with its investigation and solution plan written; returns the task ID."""
+    task_id = "test-task"
+    task_dir = isolated_working_dir / server.BASE_DIR / task_id
+    task_dir.mkdir(parents=True)
+    (task_dir / "INVESTIGATION.md").write_text(sample_investigation_content)
+    (task_dir / "SOLUTION_PLAN.md").write_text(sample_solution_plan_content)
+    return task_id
+
+
+@pytest.fixture
+def prepared_task_with_checklist(prepared_task: str) -> str:
+    """Like prepared_task, but with an empty CHECKLIST.json as well."""
+    server.write_checklist(prepared_task, [])
+    return prepared_task